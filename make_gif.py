@@ -1,22 +1,24 @@
 from PIL import Image, ImageDraw
 import os
-import glob
 import math
+import functools
+import collections
 from tqdm import tqdm
 import json
 from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
 import multiprocessing
 
-def crop_to_half_circle(image, center, radius, direction=270):
+def half_circle_mask(size, center, radius, direction=270):
     """
-    Crop the image into a half-circle shape pointing in a specified direction.
-    :param image: PIL Image object
+    Build the half-circle mask used by crop_to_half_circle.
+    :param size: Size (width, height) of the images the mask is applied to
     :param center: Tuple (x, y) for the center of the half-circle
     :param radius: Radius of the half-circle
     :param direction: Direction in degrees where the half-circle points (default is 270)
-    :return: Cropped PIL Image object
+    :return: L-mode PIL Image, 255 inside the half-circle and 0 elsewhere
     """
-    mask = Image.new("L", image.size, 0)
+    mask = Image.new("L", size, 0)
     draw = ImageDraw.Draw(mask)
     x, y = center
 
@@ -26,6 +28,18 @@ def crop_to_half_circle(image, center, radius, direction=270):
 
     # Draw a half-circle mask
     draw.pieslice([x - radius, y - radius, x + radius, y + radius], start=start_angle, end=end_angle, fill=255)
+    return mask
+
+def crop_to_half_circle(image, center, radius, direction=270):
+    """
+    Crop the image into a half-circle shape pointing in a specified direction.
+    :param image: PIL Image object
+    :param center: Tuple (x, y) for the center of the half-circle
+    :param radius: Radius of the half-circle
+    :param direction: Direction in degrees where the half-circle points (default is 270)
+    :return: Cropped PIL Image object
+    """
+    mask = half_circle_mask(image.size, center, radius, direction)
 
     # Apply the mask to the image
     cropped_image = Image.new("RGBA", image.size)
@@ -34,53 +48,112 @@ def crop_to_half_circle(image, center, radius, direction=270):
 
     return cropped_image, mask
 
-def create_gif_semicircle(image_paths, center, radius, direction, output_path, fps=60):
+def tick_overlay(size, center, radius, direction=270):
     """
-    Create a GIF from a list of images cropped to a half-circle, with lines every 30 degrees.
-    :param image_paths: List of image file paths
+    Draw the tick marks of the half-circle, every 10 degrees, on a transparent image.
+    :param size: Size (width, height) of the images the overlay is composited on
     :param center: Tuple (x, y) for the center of the half-circle
     :param radius: Radius of the half-circle
-    :param output_path: Path to save the output GIF
-    :param fps: frames per second
+    :param direction: Direction in degrees where the half-circle points (default is 270)
+    :return: RGBA PIL Image with white ticks and a transparent background
     """
-    frames = []
-    for img_path in tqdm(image_paths, desc="Processing images"):
-        image = Image.open(img_path).convert("RGBA")
-        cropped_image, mask = crop_to_half_circle(image, center, radius, direction)
+    overlay = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
 
-        start = direction - 90
-        end = direction + 90
-        draw = ImageDraw.Draw(cropped_image)
+    start = direction - 90
+    end = direction + 90
+    for angle in range(start, end + 1, 10):  # 0 to 180 degrees, inclusive
+        x_start = center[0] + 0.9 * radius * math.cos(math.radians(angle))
+        y_start = center[1] + 0.9 * radius * math.sin(math.radians(angle))
+        x_end = center[0] + radius * math.cos(math.radians(angle))
+        y_end = center[1] + radius * math.sin(math.radians(angle))
+        draw.line([(x_start, y_start), (x_end, y_end)], fill="white", width=1, joint="curve")
+    #draw.line([center, (center[0], center[1] + radius)], fill="red", width=1, joint="curve")
+    #draw.ellipse([center[0] - 3, center[1] - 3, center[0] + 3, center[1] + 3], fill="red", outline="red")
+    return overlay
 
-        for angle in range(start, end + 1, 10):  # 0 to 180 degrees, inclusive
-            x_start = center[0] + 0.9 * radius * math.cos(math.radians(angle))
-            y_start = center[1] + 0.9 * radius * math.sin(math.radians(angle))
-            x_end = center[0] + radius * math.cos(math.radians(angle))
-            y_end = center[1] + radius * math.sin(math.radians(angle))
-            draw.line([(x_start, y_start), (x_end, y_end)], fill="white", width=1, joint="curve")
-        #draw.line([center, (center[0], center[1] + radius)], fill="red", width=1, joint="curve")
-        #draw.ellipse([center[0] - 3, center[1] - 3, center[0] + 3, center[1] + 3], fill="red", outline="red")
+@functools.lru_cache(maxsize=8)
+def half_circle_layers(size, center, radius, direction):
+    """
+    Build the mask and the tick overlay for one GIF, both cropped to the mask's
+    bounding box. These only depend on the frame size, center, radius and
+    direction, so they are shared by every frame instead of being drawn again
+    for each one.
+    :return: Tuple (mask, bbox, overlay)
+    """
+    mask = half_circle_mask(size, center, radius, direction)
+    bbox = mask.getbbox()
+    overlay = tick_overlay(size, center, radius, direction).crop(bbox)
+    return mask.crop(bbox), bbox, overlay
 
-        cropped_image = cropped_image.crop(mask.getbbox())
-        frames.append(cropped_image)
+def semicircle_frame(img_path, center, radius, direction):
+    """
+    Load one image, crop it to the half-circle and add the tick marks.
+    :param img_path: Image file path
+    :param center: Tuple (x, y) for the center of the half-circle
+    :param radius: Radius of the half-circle
+    :param direction: Direction in degrees where the half-circle points
+    :return: RGBA PIL Image cropped to the half-circle's bounding box
+    """
+    with Image.open(img_path) as image:
+        mask, bbox, overlay = half_circle_layers(image.size, center, radius, direction)
+        # Only the half-circle's bounding box ends up in the GIF, so the frame
+        # is cropped first and the conversion and masking work on that tile.
+        tile = image.crop(bbox).convert("RGBA")
+    cropped_image = Image.new("RGBA", tile.size)
+    cropped_image.paste(tile, mask=mask)
+    cropped_image.alpha_composite(overlay)
+    return cropped_image
 
-    # Save frames as a GIF
-    frames[0].save(output_path, save_all=True, append_images=frames[1:], duration=1000 // fps, loop=0)
+def semicircle_frames(image_paths, center, radius, direction, workers=1):
+    """
+    Yield the processed frames in order, as semicircle_frame returns them.
+    :param image_paths: List of image file paths
+    :param center: Tuple (x, y) for the center of the half-circle
+    :param radius: Radius of the half-circle
+    :param direction: Direction in degrees where the half-circle points
+    :param workers: Number of threads processing frames concurrently
+    :return: Generator of RGBA PIL Images
+    """
+    center = tuple(center)  # Hashable, for half_circle_layers' cache.
+    # Pillow releases the GIL while decoding and compositing, so frames can be
+    # processed on several threads. Only a few frames are queued ahead of the
+    # consumer, so memory use does not grow with the length of the GIF.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for img_path in tqdm(image_paths, desc="Processing images"):
+            pending.append(executor.submit(semicircle_frame, img_path, center, radius, direction))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def create_gif_semicircle(image_paths, center, radius, direction, output_path, fps=60, workers=1):
+    """
+    Create a GIF from a list of images cropped to a half-circle, with lines every 30 degrees.
+    :param image_paths: List of image file paths
+    :param center: Tuple (x, y) for the center of the half-circle
+    :param radius: Radius of the half-circle
+    :param output_path: Path to save the output GIF
+    :param fps: frames per second
+    :param workers: Number of threads processing frames concurrently
+    """
+    # Save frames as a GIF. The encoder pulls the frames one at a time, so the
+    # full-colour frames are never all held in memory at once.
+    frames = semicircle_frames(image_paths, center, radius, direction, workers)
+    first_frame = next(frames, None)
+    if first_frame is None:
+        raise ValueError(f"No images to write to {output_path}")
+    first_frame.save(output_path, save_all=True, append_images=frames, duration=1000 // fps, loop=0)
 
 def process_gif(args):
     """
     Process a single GIF creation task for multiprocessing.
-    :param args: Tuple containing (i, data_list, image_paths_list, file_name)
+    :param args: Tuple containing (center, direction, image_paths, output_path, workers)
     """
-    idx, data_list, image_paths_list, file_name = args
+    center, direction, image_paths, output_path, workers = args
     radius = 128
-    direction = data_list[idx]['direction'] - 180
-    center = data_list[idx]['point1']
-    init_frame = data_list[idx]['batch_start_index']
-    end_frame = data_list[idx]['batch_end_index']
-    selected_image_paths = image_paths_list[init_frame:end_frame]
-    output_path = f"gifs/{file_name}_output_{idx + 1:04d}.gif"
-    create_gif_semicircle(selected_image_paths, center, radius, direction, output_path, fps=24)
+    create_gif_semicircle(image_paths, center, radius, direction, output_path, fps=24, workers=workers)
 
 if __name__ == "__main__":
     parent_dir = r"C:\Users\axt5780\OneDrive - The Pennsylvania State University\Documents\USGS\Datasets\UAS Colorado 2023"
@@ -91,9 +164,22 @@ if __name__ == "__main__":
         data_list = json.load(f)
 
     frames_dir = os.path.join(parent_dir, specific_file, 'frames')
-    image_paths_list = glob.glob(os.path.join(frames_dir, "*.jpg"))
+    # Frames are sliced by index below, so they must be in name order; glob
+    # gives no ordering guarantee and stats more than needed.
+    with os.scandir(frames_dir) as it:
+        image_paths_list = sorted(e.path for e in it if e.name[-4:].lower() == '.jpg' and e.is_file())
 
-    args_list = [(i, data_list, image_paths_list, specific_file) for i in range(len(data_list))]
+    # The GIFs are already spread over one process per core; only use extra
+    # threads per GIF when there are fewer GIFs than cores.
+    workers = max(1, multiprocessing.cpu_count() // max(1, len(data_list)))
+    # Each task only gets its own slice of the frame list, so the whole list is
+    # not pickled once per GIF.
+    args_list = [(data['point1'],
+                  data['direction'] - 180,
+                  image_paths_list[data['batch_start_index']:data['batch_end_index']],
+                  f"gifs/{specific_file}_output_{i + 1:04d}.gif",
+                  workers)
+                 for i, data in enumerate(data_list)]
     print(f"Available CPU cores: {multiprocessing.cpu_count()}")
     with Pool(processes=multiprocessing.cpu_count()) as pool:
         pool.map(process_gif, args_list)
\ No newline at end of file